@@ -8,10 +8,9 @@ and validates the output format.
 """
 
 import os
-import json
 import sys
 import time
-from simple_extractor import extract_pdf_outline
+from simple_extractor import extract_pdf_outline, write_json
 
 def create_test_structure():
     """Create test directory structure."""
@@ -124,8 +123,7 @@ def test_pdf_processing():
                 
                 # Save test output
                 output_path = os.path.join("data", os.path.splitext(os.path.basename(pdf_path))[0] + "_test.json")
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(outline, f, indent=2, ensure_ascii=False)
+                write_json(outline, output_path)
                 print(f"💾 Test output saved to: {output_path}")
                 
             else:
@@ -184,8 +182,7 @@ def create_sample_json():
     }
     
     # Save sample
-    with open("data/sample_output.json", 'w', encoding='utf-8') as f:
-        json.dump(sample_output, f, indent=2, ensure_ascii=False)
+    write_json(sample_output, "data/sample_output.json")
     
     print("📄 Sample JSON output created: data/sample_output.json")
 